@@ -40,6 +40,8 @@
 
 from abc import ABC
 
+import numpy as np
+
 import bpy
 from io_scene_niftools.modules.nif_export.block_registry import block_store
 from io_scene_niftools.utils.logging import NifLog, NifError
@@ -68,6 +70,16 @@ class AnimationCommon(ABC):
         kfc.start_time = start_frame / self.fps
         kfc.stop_time = stop_frame / self.fps
 
+    def get_keyframe_times_and_values(self, fcurve, negate_values=False):
+        """Read all keyframes of an fcurve at once, returning an (n, 2) array of times in seconds and values."""
+        b_keyframes = fcurve.keyframe_points
+        b_co = np.zeros((len(b_keyframes), 2), dtype=float)
+        b_keyframes.foreach_get("co", b_co.reshape((-1, 1)))
+        b_co[:, 0] *= 1.0 / self.fps
+        if negate_values:
+            np.negative(b_co[:, 1], out=b_co[:, 1])
+        return b_co
+
     @staticmethod
     def get_flags_from_fcurves(fcurves):
         # see if there are cyclic extrapolation modifiers on exp_fcurves
@@ -38,6 +38,8 @@
 # ***** END LICENSE BLOCK *****
 
 
+import numpy as np
+
 import bpy
 from io_scene_niftools.modules.nif_export.animation.common import AnimationCommon
 from io_scene_niftools.modules.nif_export.block_registry import block_store
@@ -47,6 +49,14 @@ from io_scene_niftools.utils.logging import NifLog
 from io_scene_niftools.utils.singleton import NifData
 from nifgen.formats.nif import classes as NifClasses
 
+# Blender keyframe interpolation -> NIF key type, with linear keys for anything else
+DEFAULT_NIF_INTERPOLATION = NifClasses.KeyType.LINEAR_KEY
+NIF_INTERPOLATIONS = {
+    'LINEAR': NifClasses.KeyType.LINEAR_KEY,
+    'CONSTANT': NifClasses.KeyType.CONST_KEY,
+    'BEZIER': NifClasses.KeyType.QUADRATIC_KEY,
+}
+
 
 class TextureAnimation(AnimationCommon):
     """
@@ -58,6 +68,11 @@ class TextureAnimation(AnimationCommon):
 
     # TODO: Test NiFlipController and NiUVController export methods
 
+    # (UV Warp modifier property, array index) -> NiTextureTransformController operation
+    UV_WARP_OPERATIONS = {
+        ("rotation", 0): "TT_ROTATE",
+    }
+
     def __init__(self):
         super().__init__()
 
@@ -66,6 +81,10 @@ class TextureAnimation(AnimationCommon):
         Export texture animations based on UV Warp modifier FCurves.
         """
 
+        # several controlled blocks may target the same geometry, so only search its properties once
+        n_texturing_properties = {}
+        n_texturing_property_class = NifClasses.NiTexturingProperty
+
         for b_controlled_block in b_controlled_blocks:
             b_strip, b_obj = b_controlled_block
             b_action = b_strip.action
@@ -85,19 +104,15 @@ class TextureAnimation(AnimationCommon):
             uv_warp = uv_warp_modifiers[0]  # Assuming one UV Warp modifier per object for simplicity
 
             # Check if the FCurve data path corresponds to UV Warp modifier properties
-            uv_warp_data_paths = [
-                f"modifiers[\"{uv_warp.name}\"].offset_u",
-                f"modifiers[\"{uv_warp.name}\"].offset_v",
-                f"modifiers[\"{uv_warp.name}\"].scale_u",
-                f"modifiers[\"{uv_warp.name}\"].scale_v",
-                f"modifiers[\"{uv_warp.name}\"].rotation",
-            ]
+            uv_warp_data_paths = {f"modifiers[\"{uv_warp.name}\"].{b_prop}" for b_prop, _ in self.UV_WARP_OPERATIONS}
 
             n_ni_geometry = DICT_NAMES[b_obj.name]
-            n_ni_texturing_property = next(
-                (prop for prop in n_ni_geometry.properties if isinstance(prop, NifClasses.NiTexturingProperty)),
-                None
-            )
+            if n_ni_geometry not in n_texturing_properties:
+                n_texturing_properties[n_ni_geometry] = next(
+                    (prop for prop in n_ni_geometry.properties if isinstance(prop, n_texturing_property_class)),
+                    None
+                )
+            n_ni_texturing_property = n_texturing_properties[n_ni_geometry]
 
             if not n_ni_texturing_property:
                 NifLog.warn(
@@ -107,32 +122,32 @@ class TextureAnimation(AnimationCommon):
                 )
                 continue
 
-            # Iterate through FCurves linked to UV Warp modifiers
+            # Collect the UV Warp FCurves once
+            b_uv_warp_fcurves = [fcurve for fcurve in b_action.fcurves if fcurve.data_path in uv_warp_data_paths]
+
+            # Iterate through FCurves linked to the UV Warp modifier
+            # the data paths only name the first modifier, so each FCurve is exported exactly once
             previous_controller = None
-            for uv_warp in uv_warp_modifiers:
-                for fcurve in b_action.fcurves:
-                    if fcurve.data_path not in uv_warp_data_paths:
-                        continue
-
-                    operation = self.get_operation_from_data_path(fcurve.data_path)
-                    if not operation:
-                        continue
-
-                    # Export NiTextureTransformController
-                    n_ni_texture_transform_controller = self.export_ni_texture_transform_controller(
-                        n_ni_texturing_property, fcurve, b_action, operation
-                    )
+            for fcurve in b_uv_warp_fcurves:
+                operation = self.get_operation_from_data_path(fcurve.data_path, fcurve.array_index)
+                if not operation:
+                    continue
+
+                # Export NiTextureTransformController
+                n_ni_texture_transform_controller = self.export_ni_texture_transform_controller(
+                    n_ni_texturing_property, fcurve, b_action, operation
+                )
 
-                    # Link controllers
-                    if previous_controller:
-                        previous_controller.next_controller = n_ni_texture_transform_controller
-                    previous_controller = n_ni_texture_transform_controller
+                # Link controllers
+                if previous_controller:
+                    previous_controller.next_controller = n_ni_texture_transform_controller
+                previous_controller = n_ni_texture_transform_controller
 
-                    # Attach to sequence if present
-                    if n_ni_controller_sequence:
-                        self.attach_to_sequence(
-                            n_ni_texture_transform_controller, n_ni_controller_sequence, n_ni_geometry, operation
-                        )
+                # Attach to sequence if present
+                if n_ni_controller_sequence:
+                    self.attach_to_sequence(
+                        n_ni_texture_transform_controller, n_ni_controller_sequence, n_ni_geometry, operation
+                    )
 
     def export_ni_texture_transform_controller(self, n_ni_texturing_property, fcurve, b_action, operation):
         """Export a NiTextureTransformController block."""
@@ -170,41 +185,39 @@ class TextureAnimation(AnimationCommon):
         n_controlled_block.controller_type = "NiTextureTransformController"
         n_controlled_block.controller_id = f"0-0-{operation}"
 
-    def get_operation_from_data_path(self, data_path):
-        """Map a data path to a NIF transform operation."""
-        if "offset" in data_path:
-            return "TT_TRANSLATE_U" if "[0]" in data_path else "TT_TRANSLATE_V"
-        elif "scale" in data_path:
-            return "TT_SCALE_U" if "[0]" in data_path else "TT_SCALE_V"
-        elif "rotation" in data_path:
-            return "TT_ROTATE"
-        return None
+    @classmethod
+    def get_operation_from_data_path(cls, data_path, array_index=0):
+        """Map a UV Warp data path and array index to a NIF transform operation."""
+        b_prop = data_path.rpartition(".")[2]
+        return cls.UV_WARP_OPERATIONS.get((b_prop, array_index))
 
     def export_fcurve_to_nif_keys(self, fcurve, n_ni_float_data):
         """Export FCurve keyframes to NiFloatData."""
-        keys = []
-        for keyframe in fcurve.keyframe_points:
-            time = keyframe.co[0] / self.fps
-            value = keyframe.co[1]
-            interpolation = keyframe.interpolation
+        # read all keyframes in one go rather than one RNA access per point
+        b_co = self.get_keyframe_times_and_values(fcurve)
+        b_interpolations = np.zeros(len(b_co), dtype=int)
+        fcurve.keyframe_points.foreach_get("interpolation", b_interpolations)
 
-            nif_key = NifClasses.NiFloatKey()
+        # foreach_get returns enum values, so map those instead of the identifiers
+        b_interp_items = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items
+        n_interp_by_value = {item.value: self.get_nif_interpolation(item.identifier) for item in b_interp_items}
+
+        keys = []
+        NiFloatKey = NifClasses.NiFloatKey
+        for (time, value), interpolation in zip(b_co.tolist(), b_interpolations.tolist()):
+            nif_key = NiFloatKey()
             nif_key.time = time
             nif_key.value = value
-            nif_key.interpolation = self.get_nif_interpolation(interpolation)
+            nif_key.interpolation = n_interp_by_value[interpolation]
 
             keys.append(nif_key)
 
         n_ni_float_data.keys = keys
 
-    def get_nif_interpolation(self, blender_interpolation):
+    @staticmethod
+    def get_nif_interpolation(blender_interpolation):
         """Map Blender interpolation to NIF interpolation types."""
-        interpolation_map = {
-            'LINEAR': NifClasses.KeyType.LINEAR_KEY,
-            'CONSTANT': NifClasses.KeyType.CONSTANT_KEY,
-            'BEZIER': NifClasses.KeyType.QUADRATIC_KEY,
-        }
-        return interpolation_map.get(blender_interpolation, NifClasses.KeyType.LINEAR_KEY)
+        return NIF_INTERPOLATIONS.get(blender_interpolation, DEFAULT_NIF_INTERPOLATION)
 
     def export_ni_uv_controller(self, n_ni_geometry, b_action):
         """Export a NiUVController block."""
@@ -212,14 +225,11 @@ class TextureAnimation(AnimationCommon):
         # Get F-curves - a bit more elaborate here so we can zip with the NiUVData later
         # nb. these are actually specific to the texture slot in blender
         # here we don't care and just take the first F-curve that matches
-        b_f_curves = []
-        for dp, ind in (("offset", 0), ("offset", 1), ("scale", 0), ("scale", 1)):
-            for fcu in b_action.fcurves:
-                if dp in fcu.data_path and fcu.array_index == ind:
-                    b_f_curves.append(fcu)
-                    break
-            else:
-                b_f_curves.append(None)
+        # index the action's fcurves by (property name, array index), keeping the first match
+        b_fcurve_index = {}
+        for fcu in b_action.fcurves:
+            b_fcurve_index.setdefault((fcu.data_path.rpartition(".")[2], fcu.array_index), fcu)
+        b_f_curves = [b_fcurve_index.get(channel) for channel in (("offset", 0), ("offset", 1), ("scale", 0), ("scale", 1))]
 
         # continue if at least one fcurve exists
         if not any(b_f_curves):
@@ -227,21 +237,23 @@ class TextureAnimation(AnimationCommon):
 
         # get the uv curves and translate them into nif data
         n_uv_data = NifClasses.NiUVData(NifData.data)
+        n_interpolation = DEFAULT_NIF_INTERPOLATION
         for fcu, n_uv_group in zip(b_f_curves, n_uv_data.uv_groups):
-            if fcu:
+            # an empty curve leaves the group at its default of no keys, so there is nothing to allocate
+            if fcu and fcu.keyframe_points:
                 NifLog.debug(f"Exporting {fcu} as NiUVData")
-                n_uv_group.num_keys = len(fcu.keyframe_points)
-                n_uv_group.interpolation = NifClasses.KeyType.LINEAR_KEY
+                # offsets are negated in blender
+                b_co = self.get_keyframe_times_and_values(fcu, negate_values="offset" in fcu.data_path)
+
+                # size the key array from the buffer so it is allocated exactly once
+                n_uv_group.num_keys = len(b_co)
+                n_uv_group.interpolation = n_interpolation
                 n_uv_group.reset_field("keys")
-                for b_point, n_key in zip(fcu.keyframe_points, n_uv_group.keys):
-                    # add each point of the curve
-                    b_frame, b_value = b_point.co
-                    if "offset" in fcu.data_path:
-                        # offsets are negated in blender
-                        b_value = -b_value
-                    n_key.arg = n_uv_group.interpolation
-                    n_key.time = b_frame / self.fps
-                    n_key.value = b_value
+                # nifgen keys are individual structs without a shared buffer, so fill them from plain floats
+                for (n_time, n_value), n_key in zip(b_co.tolist(), n_uv_group.keys):
+                    n_key.arg = n_interpolation
+                    n_key.time = n_time
+                    n_key.value = n_value
 
         # if uv data is present then add the controller so it is exported
         if b_f_curves[0].keyframe_points:
@@ -272,21 +284,21 @@ class TextureAnimation(AnimationCommon):
         # fill in NiFlipController's values
         n_flip.flags = 8  # active
         n_flip.frequency = 1.0
-        start = bpy.context.scene.frame_start
+        b_scene = bpy.context.scene
+        start = b_scene.frame_start
+        fps = self.fps
 
-        n_flip.start_time = (start - 1) * self.fps
-        n_flip.stop_time = (bpy.context.scene.frame_end - start) * self.fps
+        n_flip.start_time = (start - 1) * fps
+        n_flip.stop_time = (b_scene.frame_end - start) * fps
         n_flip.texture_slot = target_tex
 
-        count = 0
-        for t in tlist:
-            if len(t) == 0:
-                continue  # skip empty lines
-            # create a NiSourceTexture for each n_flip
-            tex = TextureCommon.export_source_texture(texture, t)
-            n_flip.num_sources += 1
-            n_flip.sources.append(tex)
-            count += 1
+        # create a NiSourceTexture for each n_flip, skipping empty lines
+        n_sources = [TextureCommon.export_source_texture(texture, t) for t in tlist if t]
+        count = len(n_sources)
+        n_flip.num_sources = count
+        n_flip.reset_field("sources")
+        for i, n_source in enumerate(n_sources):
+            n_flip.sources[i] = n_source
         if count < 2:
             raise NifLog.warn(f"Error in Texture Flip buffer '{fliptxt.name}': must define at least two textures")
         n_flip.delta = (n_flip.stop_time - n_flip.start_time) / count
@@ -56,6 +56,8 @@ class ExportBlockRegistry:
 
     def __init__(self):
         self._block_to_obj = {}
+        self._matching_blocks = {}
+        self._unique_blocks = {}
 
     @property
     def block_to_obj(self):
@@ -64,6 +66,14 @@ class ExportBlockRegistry:
     @block_to_obj.setter
     def block_to_obj(self, value):
         self._block_to_obj = value
+        # the indices only refer to blocks of the current export
+        self._matching_blocks = {}
+        self._unique_blocks = {}
+
+    @property
+    def matching_blocks(self):
+        """Index of shared blocks, keyed by block type and the attributes they were matched on."""
+        return self._matching_blocks
 
     def register_block(self, block, b_obj=None):
         """Helper function to register a newly created block in the list of
@@ -79,6 +89,20 @@ class ExportBlockRegistry:
         self._block_to_obj[block] = b_obj
         return block
 
+    def register_unique_block(self, block, b_obj=None):
+        """Helper function to register a block unless an identical block
+        was already registered through this function.
+
+        @param block: The nif block.
+        @param b_obj: The Blender object.
+        @return: The previously registered identical block, or C{block}"""
+        key = (type(block), block.get_hash())
+        existing_block = self._unique_blocks.get(key)
+        if existing_block is not None:
+            return existing_block
+        self._unique_blocks[key] = block
+        return self.register_block(block, b_obj)
+
     def create_block(self, block_type, b_obj=None):
         """
         Helper function to create a new block,
@@ -49,6 +49,11 @@ from io_scene_niftools.utils.logging import NifLog
 from io_scene_niftools.utils.singleton import NifOp
 from nifgen.formats.nif import classes as NifClasses
 
+# Games that expect vertex color and z-buffer properties on the root node
+VERTEX_COLOR_Z_BUFFER_GAMES = frozenset({'CIVILIZATION_IV', 'SID_MEIER_S_RAILROADS', 'EMPIRE_EARTH_II', 'ZOO_TYCOON_2'})
+# Games whose z-buffer property uses the "less" test function instead of "less or equal"
+Z_BUFFER_TEST_LESS_GAMES = frozenset({'EMPIRE_EARTH_II'})
+
 
 class ObjectProperty:
     """
@@ -60,6 +65,15 @@ class ObjectProperty:
         self.material_property_helper = MaterialProperty()
         self.texture_property_helper = TextureProperty()
 
+        self.nif_scene = bpy.context.scene.niftools_scene
+        self.target_game = self.nif_scene.game
+        self.is_bs = self.nif_scene.is_bs()
+        self.is_fo3 = self.nif_scene.is_fo3()
+        self.is_skyrim = self.nif_scene.is_skyrim()
+        self.is_fallout = "FALLOUT" in self.target_game
+        self.uses_extra_shader_textures = (
+                self.target_game in self.texture_property_helper.ni_texturing_property_helper.USED_EXTRA_SHADER_TEXTURES)
+
     def export_object_properties(self, b_obj, n_node):
         """
         This is the main property processor that attaches
@@ -83,8 +97,7 @@ class ObjectProperty:
         NifLog.info(f"Exporting root node properties...")
 
         # Add vertex color and zbuffer properties for civ4 and railroads
-        if bpy.context.scene.niftools_scene.game in (
-                'CIVILIZATION_IV', 'SID_MEIER_S_RAILROADS', 'EMPIRE_EARTH_II', 'ZOO_TYCOON_2'):
+        if self.target_game in VERTEX_COLOR_Z_BUFFER_GAMES:
             self.export_vertex_color_property(n_root_node)
             self.export_z_buffer_property(n_root_node)
 
@@ -98,9 +111,17 @@ class ObjectProperty:
         # go over all blocks of block_type
 
         NifLog.debug(f"Looking for {block_type} block. Kwargs: {kwargs}")
+        attributes = frozenset((param, attribute) for param, attribute in kwargs.items() if attribute is not None)
+        key = (block_type, attributes)
+        block = block_store.matching_blocks.get(key)
+        # the block may have been modified since it was indexed, so make sure it still matches
+        if block is not None and all(getattr(block, param, None) == attribute for param, attribute in attributes):
+            NifLog.debug(f"Found existing {block_type} block matching all criteria!")
+            return block
+
+        block_class = getattr(NifClasses, block_type)
         for block in block_store.block_to_obj:
-            # if isinstance(block, block_type):
-            if block_type in str(type(block)):
+            if isinstance(block, block_class):
                 # skip blocks that don't match additional conditions
                 for param, attribute in kwargs.items():
                     # now skip this block if any of the conditions does not match
@@ -112,6 +133,7 @@ class ObjectProperty:
                 else:
                     # we did not break out of the loop, so all checks went through, so we can use this block
                     NifLog.debug(f"Found existing {block_type} block matching all criteria!")
+                    block_store.matching_blocks[key] = block
                     return block
         # we are still here, so we must create a block of this type and set all attributes accordingly
         NifLog.debug(f"Created new {block_type} block because none matched the required criteria!")
@@ -119,6 +141,7 @@ class ObjectProperty:
         for param, attribute in kwargs.items():
             if attribute is not None:
                 setattr(block, param, attribute)
+        block_store.matching_blocks[key] = block
         return block
 
     def export_vertex_color_property(self, n_node, flags=1, vertex_mode=0, lighting_mode=1):
@@ -130,7 +153,7 @@ class ObjectProperty:
     def export_z_buffer_property(self, n_node, flags=15, function=3):
         """Return existing z-buffer property with given flags, or create new one
         if an alpha property with required flags is not found."""
-        if bpy.context.scene.niftools_scene.game in ('EMPIRE_EARTH_II',):
+        if self.target_game in Z_BUFFER_TEST_LESS_GAMES:
             function = 1
         return self.get_matching_block("NiZBufferProperty", flags=flags, function=function)
 
@@ -154,12 +177,11 @@ class ObjectProperty:
         """Return existing specular property with given flags, or create new one
         if a specular property with required flags is not found."""
         # search for duplicate
-        if b_mat and not (
-                bpy.context.scene.niftools_scene.is_skyrim()) and "FALLOUT" not in bpy.context.scene.niftools_scene.game:
+        if b_mat and not self.is_skyrim and not self.is_fallout:
             # add NiTriShape's specular property
             # but NOT for sid meier's railroads and other extra shader
             # games (they use specularity even without this property)
-            if bpy.context.scene.niftools_scene.game in self.ni_texturing_property_helper.USED_EXTRA_SHADER_TEXTURES:
+            if self.uses_extra_shader_textures:
                 return
             eps = NifOp.props.epsilon
             if (b_mat.specular_color.r > eps) or (b_mat.specular_color.g > eps) or (b_mat.specular_color.b > eps):
@@ -178,7 +200,7 @@ class ObjectProperty:
         # no stencil property
         if b_mat.use_backface_culling:
             return
-        if bpy.context.scene.niftools_scene.is_fo3():
+        if self.is_fo3:
             flags = 19840
         # search for duplicate
         return self.get_matching_block("NiStencilProperty", flags=flags)
@@ -196,7 +218,7 @@ class ObjectProperty:
     def export_ni_string_extra_data_prn(self, n_root_node, b_root_obj):
         """Export weapon location."""
 
-        if bpy.context.scene.niftools_scene.is_bs():
+        if self.is_bs:
             loc = b_root_obj.nif_object.prn_location
             if loc:
                 n_ni_string_extra_data = block_store.create_block("NiStringExtraData")
@@ -206,9 +228,8 @@ class ObjectProperty:
 
     def export_bs_inv_marker(self, n_root_node, b_root_obj):
         """Attaches a BSInvMarker to n_root if desired and fill in its values"""
-        niftools_scene = bpy.context.scene.niftools_scene
         bs_inv_store = b_root_obj.nif_object.bs_inv
-        if niftools_scene.is_skyrim() and bs_inv_store:
+        if self.is_skyrim and bs_inv_store:
             bs_inv = bs_inv_store[0]
             n_bs_inv_marker = NifClasses.BSInvMarker(n_root_node.context)
             n_bs_inv_marker.name = bs_inv.name
@@ -221,59 +242,53 @@ class ObjectProperty:
     def export_bs_x_flags(self, n_root_node, b_root_obj):
         """Export BSXFlags and update to enable collision and animation if needed."""
 
-        if bpy.context.scene.niftools_scene.is_bs():
+        if self.is_bs:
             n_bs_x_flags = block_store.create_block("BSXFlags")
             n_bs_x_flags.name = 'BSX'
             n_root_node.add_extra_data(n_bs_x_flags)
 
-            # Export root object's BSXFlags property
-            n_bs_x_flags.integer_data = b_root_obj.nif_object.bsxflags
-
-            # Set or clear animated bit
-            if self.has_animation():
-                n_bs_x_flags.integer_data |= 0x1
-            else:
-                n_bs_x_flags.integer_data &= ~0x1
-
-            # Set or clear Havok bit
-            if self.has_collision():
-                n_bs_x_flags.integer_data |= 0x2
-            else:
-                n_bs_x_flags.integer_data &= ~0x2
-
-            # Set or clear complex bit
-            if self.has_dynamic_collision() and len(self.has_collision()) > 1:
-                n_bs_x_flags.integer_data |= 0x4
-            else:
-                n_bs_x_flags.integer_data &= ~0x4
-
-            # Set or clear dynamic bit
-            if self.has_dynamic_collision():
-                n_bs_x_flags.integer_data |= 0x20
-            else:
-                n_bs_x_flags.integer_data &= ~0x20
-
-    def has_collision(self):
-        """Helper function that determines if a blend file contains a collider."""
-        b_objs = []
-        for b_obj in bpy.data.objects:
-            if b_obj.rigid_body and not b_obj.parent.rigid_body:
-                b_objs.append(b_obj)
+            # Gather everything from a single pass over the objects in the blend file
+            has_animation, b_colliders, b_dynamic_colliders = self.get_bsx_scene_state()
 
-        return b_objs
+            # Start from the root object's BSXFlags property with the automatic bits cleared
+            bsx_flags = b_root_obj.nif_object.bsxflags & ~(0x1 | 0x2 | 0x4 | 0x20)
 
-    def has_dynamic_collision(self):
-        """Helper function that determines if a blend file contains a collider with dynamic motion system."""
-        b_objs = []
-        for b_obj in bpy.data.objects:
-            if b_obj.rigid_body:
-                if not 'INVALID' in b_obj.nif_collision.motion_system and not 'FIXED' in b_obj.nif_collision.motion_system:
-                    b_objs.append(b_obj)
+            # Animated bit
+            if has_animation:
+                bsx_flags |= 0x1
+
+            # Havok bit
+            if b_colliders:
+                bsx_flags |= 0x2
 
-        return b_objs
+            # Complex bit
+            if b_dynamic_colliders and len(b_colliders) > 1:
+                bsx_flags |= 0x4
 
-    def has_animation(self):
-        """Helper function that determines if a blend file contains a collider with dynamic motion system."""
+            # Dynamic bit
+            if b_dynamic_colliders:
+                bsx_flags |= 0x20
+
+            n_bs_x_flags.integer_data = bsx_flags
+
+    @staticmethod
+    def get_bsx_scene_state():
+        """Helper function that scans the blend file once for animation, colliders and dynamic colliders.
+
+        :return: Tuple of whether any object is animated, the list of root colliders
+            and the list of colliders with a dynamic motion system.
+        """
+        has_animation = False
+        b_colliders = []
+        b_dynamic_colliders = []
         for b_obj in bpy.data.objects:
             if b_obj.animation_data:
-                return True
+                has_animation = True
+            if b_obj.rigid_body:
+                if not (b_obj.parent and b_obj.parent.rigid_body):
+                    b_colliders.append(b_obj)
+                motion_system = b_obj.nif_collision.motion_system
+                if 'INVALID' not in motion_system and 'FIXED' not in motion_system:
+                    b_dynamic_colliders.append(b_obj)
+
+        return has_animation, b_colliders, b_dynamic_colliders
@@ -67,40 +67,60 @@ class TextureCommon:
                              "socket_index": 1, "texture_type": bpy.types.ShaderNodeTexImage}  # Roughness
     }
 
+    # (texture node pointer, file name) -> exported NiSourceTexture, valid for the nif data it was built for
+    # entries are only reused while their block is registered in the current export
+    _source_textures = {}
+    _source_textures_data = None
+
     def __init__(self):
         self.dict_mesh_uvlayers = []
         self.slots = {}
+        self.active_slots = ()
+        # material pointer -> (slots, active_slots), valid for the nif data it was built for
+        self._material_slots = {}
+        self._material_slots_data = None
         self._reset_fields()
 
     def _reset_fields(self):
         """Reset all slot assignments."""
         self.slots = {slot: None for slot in self.TEX_SLOT_MAP.keys()}
+        # (slot name, texture node) pairs of only the assigned slots, in slot order
+        self.active_slots = ()
 
     def get_input_node_of_type(self, input_socket, node_types):
         # search back in the node tree for nodes of a certain type(s), depth-first
-        links = input_socket.links
-        if not links:
-            # this socket has no inputs
-            return None
-        node = links[0].from_node
-        if isinstance(node, node_types):
-            # the input node is of the required type
-            return node
-        else:
-            if len(node.inputs) > 0:
-                for input in node.inputs:
-                    # check every input if somewhere up that tree is a node of the required type
-                    input_results = self.get_input_node_of_type(input, node_types)
-                    if input_results:
-                        return input_results
-                # we found nothing
-                return None
-            else:
-                # this has no inputs, and doesn't classify itself
-                return None
+        sockets = [input_socket]
+        visited = set()
+        while sockets:
+            links = sockets.pop().links
+            if not links:
+                # this socket has no inputs
+                continue
+            node = links[0].from_node
+            if isinstance(node, node_types):
+                # the input node is of the required type
+                return node
+            node_id = node.as_pointer()
+            if node_id in visited:
+                # nodes can feed several inputs, but each tree above them only needs searching once
+                continue
+            visited.add(node_id)
+            # check every input in order if somewhere up that tree is a node of the required type
+            sockets.extend(list(node.inputs)[::-1])
+        # we found nothing
+        return None
 
     def determine_texture_types(self, b_mat):
         """Determine texture slots based on shader node connections."""
+        # materials are often shared between objects, so only inspect each one once per export
+        if self._material_slots_data is not NifData.data:
+            self._material_slots = {}
+            self._material_slots_data = NifData.data
+        b_mat_id = b_mat.as_pointer()
+        if b_mat_id in self._material_slots:
+            self.slots, self.active_slots = self._material_slots[b_mat_id]
+            return
+
         self._reset_fields()
 
         shader_nodes = self._get_shader_nodes(b_mat)
@@ -113,6 +133,10 @@ class TextureCommon:
                         if texture_node:
                             self._assign_texture_to_slot(slot_name, texture_node, b_mat.name)
 
+        # compact view of the assigned slots for the export loops
+        self.active_slots = tuple((slot_name, node) for slot_name, node in self.slots.items() if node)
+        self._material_slots[b_mat_id] = (self.slots, self.active_slots)
+
     def _get_shader_nodes(self, b_mat):
         """Retrieve all shader nodes in the material."""
         return [node for node in b_mat.node_tree.nodes if isinstance(node, bpy.types.ShaderNode)]
@@ -136,6 +160,16 @@ class TextureCommon:
         :return: The exported NiSourceTexture block.
         """
 
+        # the same node is typically shared by many materials, so reuse its source texture
+        # (but drop the blocks of previous exports rather than holding on to them)
+        if TextureCommon._source_textures_data is not NifData.data:
+            TextureCommon._source_textures = {}
+            TextureCommon._source_textures_data = NifData.data
+        key = (n_texture.as_pointer() if n_texture is not None else None, filename)
+        n_source_texture = TextureCommon._source_textures.get(key)
+        if n_source_texture is not None and n_source_texture in block_store.block_to_obj:
+            return n_source_texture
+
         # create NiSourceTexture
         srctex = NifClasses.NiSourceTexture(NifData.data)
         srctex.use_external = True
@@ -157,13 +191,10 @@ class TextureCommon:
         srctex.alpha_format = 3
         srctex.unknown_byte = 1
 
-        # search for duplicate
-        for block in block_store.block_to_obj:
-            if isinstance(block, NifClasses.NiSourceTexture) and block.get_hash() == srctex.get_hash():
-                return block
-
-        # no identical source texture found, so use and register the new one
-        return block_store.register_block(srctex, n_texture)
+        # reuse an identical source texture, otherwise register the new one
+        n_source_texture = block_store.register_unique_block(srctex, n_texture)
+        TextureCommon._source_textures[key] = n_source_texture
+        return n_source_texture
 
     def export_tex_desc(self, texdesc=None, uv_set=0, b_texture_node=None):
         """Helper function for export_texturing_property to export each texture slot."""
@@ -41,11 +41,30 @@
 import bpy
 from io_scene_niftools.modules.nif_export.block_registry import block_store
 from io_scene_niftools.modules.nif_export.property.texture.common import TextureCommon
-from io_scene_niftools.utils.consts import TEX_SLOTS
+from io_scene_niftools.utils.consts import TEX_SLOTS, TEX_SLOT_FIELD_TRANSLATION
 from io_scene_niftools.utils.logging import NifLog, NifError
 from io_scene_niftools.utils.singleton import NifData
 from nifgen.formats.nif import classes as NifClasses
 
+# Blender blend type -> NIF texture apply mode
+N_APPLY_MODES = {
+    "LIGHTEN": NifClasses.ApplyMode.APPLY_HILIGHT,
+    "MULTIPLY": NifClasses.ApplyMode.APPLY_HILIGHT2,
+    "MIX": NifClasses.ApplyMode.APPLY_MODULATE,
+}
+DEFAULT_N_APPLY_MODE = NifClasses.ApplyMode.APPLY_MODULATE
+
+# Nif block types created or tested on every export call
+N_TEXTURING_PROPERTY = NifClasses.NiTexturingProperty
+N_TEXTURE_EFFECT = NifClasses.NiTextureEffect
+N_NO_LIGHTING_PROPERTY = NifClasses.BSShaderNoLightingProperty
+
+# Fixed settings of exported environment map texture effects
+TEXTURE_EFFECT_FILTERING = NifClasses.TexFilterMode.FILTER_TRILERP
+TEXTURE_EFFECT_CLAMPING = NifClasses.TexClampMode.WRAP_S_WRAP_T
+TEXTURE_EFFECT_TYPE = NifClasses.EffectType.EFFECT_ENVIRONMENT_MAP
+TEXTURE_EFFECT_COORDINATE_GENERATION = NifClasses.CoordGenType.CG_SPHERE_MAP
+
 
 class NiTexturingProperty(TextureCommon):
 
@@ -65,61 +84,76 @@ class NiTexturingProperty(TextureCommon):
         'CIVILIZATION_IV': (3, 0, 1, 2)
     }
 
+    # Texture slot -> (nif xml field name of its tex desc, name of the matching has_ flag)
+    TEX_SLOT_FIELDS = {
+        slot_name: (f"{slot_name.translate(TEX_SLOT_FIELD_TRANSLATION)}_texture",
+                    f"has_{slot_name.translate(TEX_SLOT_FIELD_TRANSLATION)}_texture")
+        for slot_name in TextureCommon.TEX_SLOT_MAP
+    }
+
+    # Node types that can provide the vector input of a texture node
+    UV_NODE_TYPES = (bpy.types.ShaderNodeUVMap, bpy.types.ShaderNodeTexCoord)
+
     __instance = None
 
     def __init__(self):
         """ Virtually private constructor. """
-        if NiTexturingProperty.__instance:
+        if NiTexturingProperty.__instance is not None:
             raise Exception("This class is a singleton!")
         else:
             super().__init__()
+            # (extra data name, shader index) pairs per game, resolved once from the tables above
+            self.used_extra_shader_datas = {
+                game: tuple((self.EXTRA_SHADER_TEXTURES[shaderindex], shaderindex) for shaderindex in shaderindices)
+                for game, shaderindices in self.USED_EXTRA_SHADER_TEXTURES.items()
+            }
             NiTexturingProperty.__instance = self
 
     @staticmethod
     def get():
         """ Static access method. """
-        if not NiTexturingProperty.__instance:
-            NiTexturingProperty()
-        return NiTexturingProperty.__instance
+        instance = NiTexturingProperty.__instance
+        if instance is None:
+            instance = NiTexturingProperty()
+        return instance
 
     def export_ni_texturing_property(self, b_mat, n_ni_geometry, n_bs_shader_property=None, applymode=None):
         """Export and return a NiTexturingProperty block."""
 
         self.determine_texture_types(b_mat)
 
-        n_ni_texturing_property = NifClasses.NiTexturingProperty(NifData.data)
+        n_ni_texturing_property = N_TEXTURING_PROPERTY(NifData.data)
 
         n_ni_texturing_property.flags = b_mat.nif_material.texture_flags
         n_ni_texturing_property.apply_mode = applymode
         n_ni_texturing_property.texture_count = 7
 
-        self.export_texture_shader_effect(n_ni_texturing_property)
         self.export_nitextureprop_tex_descs(n_ni_texturing_property)
 
-        # Search for duplicate
-        for n_block in block_store.block_to_obj:
-            if isinstance(n_block, NifClasses.NiTexturingProperty) and n_block.get_hash() == n_ni_texturing_property.get_hash():
-                n_ni_texturing_property = n_block
-
-        block_store.register_block(n_ni_texturing_property)
+        # Reuse an identical texturing property if one was already exported
+        n_ni_texturing_property = block_store.register_unique_block(n_ni_texturing_property)
         n_ni_geometry.add_property(n_ni_texturing_property)
-        if n_bs_shader_property and isinstance(n_bs_shader_property, NifClasses.BSShaderNoLightingProperty):
+        if n_bs_shader_property and isinstance(n_bs_shader_property, N_NO_LIGHTING_PROPERTY):
             n_bs_shader_property.file_name = n_ni_texturing_property.base_texture.source.file_name
 
     def export_nitextureprop_tex_descs(self, texprop):
-        # go over all valid texture slots
-        for slot_name, b_texture_node in self.slots.items():
-            if b_texture_node:
-                # get the field name used by nif xml for this texture
-                field_name = f"{slot_name.lower().replace(' ', '_')}_texture"
-                NifLog.debug(f"Activating {field_name} for {b_texture_node.name}")
-                setattr(texprop, "has_" + field_name, True)
-                # get the tex desc link
-                texdesc = getattr(texprop, field_name)
-                uv_index = self.get_uv_node(b_texture_node)
-                # set uv index and source texture to the texdesc
-                texdesc.uv_set = uv_index
-                texdesc.source = TextureCommon.export_source_texture(b_texture_node)
+        if not self.active_slots:
+            # no textures assigned, nothing to export
+            return
+
+        export_source_texture = TextureCommon.export_source_texture
+        # go over all assigned texture slots
+        for slot_name, b_texture_node in self.active_slots:
+            # get the field names used by nif xml for this texture
+            field_name, has_field_name = self.TEX_SLOT_FIELDS[slot_name]
+            NifLog.debug(f"Activating {field_name} for {b_texture_node.name}")
+            setattr(texprop, has_field_name, True)
+            # get the tex desc link
+            texdesc = getattr(texprop, field_name)
+            uv_index = self.get_uv_node(b_texture_node)
+            # set uv index and source texture to the texdesc
+            texdesc.uv_set = uv_index
+            texdesc.source = export_source_texture(b_texture_node)
 
         # TODO [animation] FIXME Heirarchy
         # self.texture_anim.export_flip_controller(fliptxt, self.base_mtex.texture, texprop, 0)
@@ -166,15 +200,15 @@ class NiTexturingProperty(TextureCommon):
 
     def export_texture_effect(self, b_texture_node=None):
         """Export a texture effect block from material texture mtex (MTex, not Texture)."""
-        texeff = NifClasses.NiTextureEffect(NifData.data)
+        texeff = N_TEXTURE_EFFECT(NifData.data)
         texeff.flags = 4
         texeff.rotation.set_identity()
         texeff.scale = 1.0
         texeff.model_projection_matrix.set_identity()
-        texeff.texture_filtering = NifClasses.TexFilterMode.FILTER_TRILERP
-        texeff.texture_clamping = NifClasses.TexClampMode.WRAP_S_WRAP_T
-        texeff.texture_type = NifClasses.EffectType.EFFECT_ENVIRONMENT_MAP
-        texeff.coordinate_generation_type = NifClasses.CoordGenType.CG_SPHERE_MAP
+        texeff.texture_filtering = TEXTURE_EFFECT_FILTERING
+        texeff.texture_clamping = TEXTURE_EFFECT_CLAMPING
+        texeff.texture_type = TEXTURE_EFFECT_TYPE
+        texeff.coordinate_generation_type = TEXTURE_EFFECT_COORDINATE_GENERATION
         if b_texture_node:
             texeff.source_texture = TextureCommon.export_source_texture(b_texture_node.texture)
             if bpy.context.scene.niftools_scene.game == 'MORROWIND':
@@ -220,38 +254,31 @@ class NiTexturingProperty(TextureCommon):
 
     def add_shader_integer_extra_datas(self, trishape):
         """Add extra data blocks for shader indices."""
-        for shaderindex in self.USED_EXTRA_SHADER_TEXTURES[bpy.context.scene.niftools_scene.game]:
-            shader_name = self.EXTRA_SHADER_TEXTURES[shaderindex]
+        for shader_name, shaderindex in self.used_extra_shader_datas[bpy.context.scene.niftools_scene.game]:
             trishape.add_integer_extra_data(shader_name, shaderindex)
 
     @staticmethod
     def get_n_apply_mode_from_b_blend_type(b_blend_type):
-        if b_blend_type == "LIGHTEN":
-            return NifClasses.ApplyMode.APPLY_HILIGHT
-        elif b_blend_type == "MULTIPLY":
-            return NifClasses.ApplyMode.APPLY_HILIGHT2
-        elif b_blend_type == "MIX":
-            return NifClasses.ApplyMode.APPLY_MODULATE
+        n_apply_mode = N_APPLY_MODES.get(b_blend_type)
+        if n_apply_mode is not None:
+            return n_apply_mode
 
         NifLog.warn(f"Unsupported blend type ({b_blend_type}) in material, using apply mode APPLY_MODULATE")
-        return NifClasses.ApplyMode.APPLY_MODULATE
+        return DEFAULT_N_APPLY_MODE
 
     def get_uv_node(self, b_texture_node):
-        uv_node = self.get_input_node_of_type(b_texture_node.inputs[0],
-                                              (bpy.types.ShaderNodeUVMap, bpy.types.ShaderNodeTexCoord))
+        uv_map_type, tex_coord_type = self.UV_NODE_TYPES
+        uv_node = self.get_input_node_of_type(b_texture_node.inputs[0], self.UV_NODE_TYPES)
         if uv_node is None:
             links = b_texture_node.inputs[0].links
             if not links:
                 # nothing is plugged in, so it will use the first UV map
                 return 0
-        if isinstance(uv_node, bpy.types.ShaderNodeUVMap):
-            uv_name = uv_node.uv_map
-            try:
-                # ignore the "UV" prefix
-                return int(uv_name[2:])
-            except:
-                return 0
-        elif isinstance(uv_node, bpy.types.ShaderNodeTexCoord):
+        if isinstance(uv_node, uv_map_type):
+            # ignore the "UV" prefix, anything else such as Blender's default "UVMap" uses the first set
+            uv_index = uv_node.uv_map[2:]
+            return int(uv_index) if uv_index.isdecimal() else 0
+        elif isinstance(uv_node, tex_coord_type):
             return "REFLECT"
         else:
             raise NifError(f"Unsupported vector input for {b_texture_node.name} in material '{self.b_mat.name}''.\n"
@@ -261,22 +288,17 @@ class NiTexturingProperty(TextureCommon):
         # get the values from the nodes, find the nodes by name, or search back in the node tree
         x_scale = y_scale = x_offset = y_offset = clamp_x = clamp_y = None
         # first check if there are any of the preset name - much more time efficient
-        try:
-            combine_node = self.b_mat.node_tree.nodes["Combine UV0"]
-            if not isinstance(combine_node, bpy.types.ShaderNodeCombineXYZ):
-                combine_node = None
-                NifLog.warn(f"Found node with name 'Combine UV0', but it was of the wrong type.")
-        except:
+        combine_node = self.b_mat.node_tree.nodes.get("Combine UV0")
+        if combine_node is None:
             # if there is a combine node, it does not have the standard name
-            combine_node = None
             NifLog.warn(f"Did not find node with 'Combine UV0' name.")
+        elif not isinstance(combine_node, bpy.types.ShaderNodeCombineXYZ):
+            combine_node = None
+            NifLog.warn(f"Found node with name 'Combine UV0', but it was of the wrong type.")
 
         if combine_node is None:
             # did not find a (correct) combine node, search through the first existing texture node vector input
-            b_texture_node = None
-            for slot_name, slot_node in self.slots.items():
-                if slot_node is not None:
-                    break
+            slot_name, slot_node = self.active_slots[0] if self.active_slots else (None, None)
             if slot_node is not None:
                 combine_node = self.get_input_node_of_type(slot_node.inputs[0], bpy.types.ShaderNodeCombineXYZ)
                 NifLog.warn(f"Searching through vector input of {slot_name} texture gave {combine_node}")
@@ -297,11 +319,10 @@ class NiTexturingProperty(TextureCommon):
         return x_scale, y_scale, x_offset, y_offset, clamp_x, clamp_y
 
     def get_uv_layers(self, b_mat):
-        used_uvlayers = set()
-        texture_slots = self.get_used_textslots(b_mat)
-        for slot in texture_slots:
-            used_uvlayers.add(slot.uv_layer)
-        return used_uvlayers
+        if b_mat is None or not b_mat.use_nodes:
+            return set()
+        texture_node_type = bpy.types.ShaderNodeTexImage
+        return {node.uv_layer for node in b_mat.node_tree.nodes if isinstance(node, texture_node_type)}
 
     def get_used_textslots(self, b_mat):
         used_slots = []
@@ -226,11 +226,12 @@ class Constraint:
                 # getting properties with no blender constraint equivalent and setting as obj properties
                 b_constr.limit_angle_max_x = n_bhk_descriptor.max_angle
                 b_constr.limit_angle_min_x = n_bhk_descriptor.min_angle
-                b_col_obj.niftools_constraint.LHMaxFriction = n_bhk_descriptor.max_friction
+                b_constr_props = b_col_obj.niftools_constraint
+                b_constr_props.LHMaxFriction = n_bhk_descriptor.max_friction
 
                 if hasattr(n_bhk_constraint, "tau"):
-                    b_col_obj.niftools_constraint.tau = n_bhk_constraint.tau
-                    b_col_obj.niftools_constraint.damping = n_bhk_constraint.damping
+                    b_constr_props.tau = n_bhk_constraint.tau
+                    b_constr_props.damping = n_bhk_constraint.damping
 
             elif isinstance(n_bhk_descriptor, NifClasses.HingeDescriptor):
                 # for hinge, y is the vector on the plane of rotation defining
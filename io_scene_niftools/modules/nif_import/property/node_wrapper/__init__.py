@@ -38,9 +38,11 @@
 # ***** END LICENSE BLOCK *****
 
 
+from functools import partialmethod
+
 import bpy
 from io_scene_niftools.modules.nif_import.property.texture.loader import TextureLoader
-from io_scene_niftools.utils.consts import TEX_SLOTS, BS_TEX_SLOTS
+from io_scene_niftools.utils.consts import TEX_SLOTS, BS_TEX_SLOTS, TEX_SLOT_FIELD_TRANSLATION
 from io_scene_niftools.utils.logging import NifLog
 from io_scene_niftools.utils.nodes import nodes_iterate
 from nifgen.formats.nif import classes as NifClasses
@@ -90,6 +92,13 @@ class NodeWrapper:
 
             # Texture Nodes
             self.b_textures = [None] * 8
+            # Images already loaded for this material, by texture source
+            self.b_images = {}
+            # UV Map nodes of this material, by uv index
+            self.b_uv_nodes = {}
+
+            # link_*_node function for each texture slot name, None if the slot is not supported
+            self.link_functions = {}
 
     @staticmethod
     def uv_node_name(uv_index):
@@ -98,46 +107,48 @@ class NodeWrapper:
     def set_uv_map(self, b_texture_node, uv_index=0, reflective=False):
         """Attaches a vector node describing the desired coordinate transforms to the texture node's UV input."""
         if reflective:
-            uv = self.b_shader_tree.nodes.new('ShaderNodeTexCoord')
-            self.b_shader_tree.links.new(uv.outputs[6], b_texture_node.inputs[0])
+            # all reflective textures of the material share one Texture Coordinate node
+            if not self.b_texture_coordinate:
+                self.b_texture_coordinate = self.b_shader_tree.nodes.new('ShaderNodeTexCoord')
+            self.b_shader_tree.links.new(self.b_texture_coordinate.outputs[6], b_texture_node.inputs[0])
         # use supplied UV maps for everything else, if present
         else:
-            uv_name = self.uv_node_name(uv_index)
-            existing_node = self.b_shader_tree.nodes.get(uv_name)
-            if not existing_node:
+            uv = self.b_uv_nodes.get(uv_index)
+            if not uv:
                 uv = self.b_shader_tree.nodes.new('ShaderNodeUVMap')
-                uv.name = uv_name
+                uv.name = self.uv_node_name(uv_index)
                 uv.uv_map = f"UV{uv_index}"
-            else:
-                uv = existing_node
+                self.b_uv_nodes[uv_index] = uv
             self.b_shader_tree.links.new(uv.outputs[0], b_texture_node.inputs[0])
 
     def global_uv_offset_scale(self, x_scale, y_scale, x_offset, y_offset, clamp_x, clamp_y):
-        # get all uv nodes (by name, since we are importing they have the predefined name
-        # and then we don't have to loop through every node
+        # get all uv nodes (set_uv_map keeps track of the ones it created for this material,
+        # so we don't have to look them up in the node tree)
         uv_nodes = {}
         uv_index = 0
-        while True:
-            uv_name = self.uv_node_name(uv_index)
-            uv_node = self.b_shader_tree.nodes.get(uv_name)
-            if uv_node and isinstance(uv_node, bpy.types.ShaderNodeUVMap):
-                uv_nodes[uv_index] = uv_node
-                uv_index += 1
-            else:
-                break
+        while uv_index in self.b_uv_nodes:
+            uv_nodes[uv_index] = self.b_uv_nodes[uv_index]
+            uv_index += 1
 
+        nodes = self.b_shader_tree.nodes
+        links = self.b_shader_tree.links
         clip_texture = clamp_x and clamp_y
 
+        # socket.links scans every link of the tree, so group the existing links by socket in a single pass
+        links_by_from_socket = {}
+        for link in links:
+            links_by_from_socket.setdefault(link.from_socket.as_pointer(), []).append(link)
+
         for uv_index, uv_node in uv_nodes.items():
             # for each of those, create a new uv output node and relink
-            split_node = self.b_shader_tree.nodes.new("ShaderNodeSeparateXYZ")
+            split_node = nodes.new("ShaderNodeSeparateXYZ")
             split_node.name = f"Separate UV{uv_index}"
             split_node.label = split_node.name
-            combine_node = self.b_shader_tree.nodes.new("ShaderNodeCombineXYZ")
+            combine_node = nodes.new("ShaderNodeCombineXYZ")
             combine_node.name = f"Combine UV{uv_index}"
             combine_node.label = combine_node.name
 
-            x_node = self.b_shader_tree.nodes.new("ShaderNodeMath")
+            x_node = nodes.new("ShaderNodeMath")
             x_node.name = f"X offset and scale UV{uv_index}"
             x_node.label = x_node.name
             x_node.operation = 'MULTIPLY_ADD'
@@ -146,33 +157,35 @@ class NodeWrapper:
             x_node.use_clamp = clamp_x and not clip_texture
             x_node.inputs[1].default_value = x_scale
             x_node.inputs[2].default_value = x_offset
-            self.b_shader_tree.links.new(split_node.outputs[0], x_node.inputs[0])
-            self.b_shader_tree.links.new(x_node.outputs[0], combine_node.inputs[0])
+            links.new(split_node.outputs[0], x_node.inputs[0])
+            links.new(x_node.outputs[0], combine_node.inputs[0])
 
-            y_node = self.b_shader_tree.nodes.new("ShaderNodeMath")
+            y_node = nodes.new("ShaderNodeMath")
             y_node.name = f"Y offset and scale UV{uv_index}"
             y_node.label = y_node.name
             y_node.operation = 'MULTIPLY_ADD'
             y_node.use_clamp = clamp_y and not clip_texture
             y_node.inputs[1].default_value = y_scale
             y_node.inputs[2].default_value = y_offset
-            self.b_shader_tree.links.new(split_node.outputs[1], y_node.inputs[0])
-            self.b_shader_tree.links.new(y_node.outputs[0], combine_node.inputs[1])
+            links.new(split_node.outputs[1], y_node.inputs[0])
+            links.new(y_node.outputs[0], combine_node.inputs[1])
 
             # get all the texture nodes to which it is linked, and re-link them to the uv output node
-            for link in uv_node.outputs[0].links:
+            uv_output = uv_node.outputs[0]
+            combine_output = combine_node.outputs[0]
+            for link in links_by_from_socket.get(uv_output.as_pointer(), ()):
                 # get the target link/socket
                 target_node = link.to_node
-                if isinstance(link.to_node, bpy.types.ShaderNodeTexImage):
+                if target_node.bl_idname == 'ShaderNodeTexImage':
                     target_socket = link.to_socket
                     # delete the existing link
-                    self.b_shader_tree.links.remove(link)
+                    links.remove(link)
                     # make new ones
-                    self.b_shader_tree.links.new(combine_node.outputs[0], target_socket)
+                    links.new(combine_output, target_socket)
                     # if we clamp in both directions, clip the images:
                     if clip_texture:
                         target_node.extension = 'CLIP'
-            self.b_shader_tree.links.new(uv_node.outputs[0], split_node.inputs[0])
+            links.new(uv_output, split_node.inputs[0])
         pass
 
     def clear_nodes(self):
@@ -182,8 +195,7 @@ class NodeWrapper:
         self.b_shader_tree = self.b_mat.node_tree
 
         # Remove existing shader nodes
-        for node in self.b_shader_tree.nodes:
-            self.b_shader_tree.nodes.remove(node)
+        self.b_shader_tree.nodes.clear()
 
         self.b_glossy_bsdf = None
         self.b_add_shader = None
@@ -194,6 +206,8 @@ class NodeWrapper:
         self.b_texture_coordinate = None
 
         self.b_textures = [None] * 8
+        self.b_images = {}
+        self.b_uv_nodes = {}
 
         # Add basic shader nodes
         self.b_principled_bsdf = self.b_shader_tree.nodes.new('ShaderNodeBsdfPrincipled')
@@ -250,12 +264,13 @@ class NodeWrapper:
 
     def create_and_link(self, slot_name, n_tex_info):
 
-        slot_name_lower = slot_name.lower().replace(' ', '_')
-
-        import_func_name = f"link_{slot_name_lower}_node"
-        import_func = getattr(self, import_func_name, None)
+        if slot_name not in self.link_functions:
+            import_func_name = f"link_{slot_name.translate(TEX_SLOT_FIELD_TRANSLATION)}_node"
+            self.link_functions[slot_name] = getattr(self, import_func_name, None)
+            if not self.link_functions[slot_name]:
+                NifLog.debug(f"Could not find texture linking function {import_func_name}")
+        import_func = self.link_functions[slot_name]
         if not import_func:
-            NifLog.debug(f"Could not find texture linking function {import_func_name}")
             return
         b_texture = self.create_texture_slot(n_tex_info)
         import_func(b_texture)
@@ -264,11 +279,11 @@ class NodeWrapper:
         # todo [texture] refactor this to separate code paths?
         # when processing a NiTextureProperty
         if isinstance(n_tex_desc, NifClasses.TexDesc):
-            b_image = self.texture_loader.import_texture_source(n_tex_desc.source)
+            b_image = self.import_texture_image(n_tex_desc.source)
             uv_layer_index = n_tex_desc.uv_set
         # when processing a BS shader property - n_tex_desc is a bare string
         else:
-            b_image = self.texture_loader.import_texture_source(n_tex_desc)
+            b_image = self.import_texture_image(n_tex_desc)
             uv_layer_index = 0
 
         # create a texture node
@@ -282,6 +297,14 @@ class NodeWrapper:
         # todo [texture] support clamping and interpolation settings
         return b_texture_node
 
+    def import_texture_image(self, source):
+        """Return the image of a texture source, only searching for it once per material."""
+        # source blocks are keyed by identity, bare path strings by value
+        source_key = source if isinstance(source, str) else id(source)
+        if source_key not in self.b_images:
+            self.b_images[source_key] = self.texture_loader.import_texture_source(source)
+        return self.b_images[source_key]
+
     def link_base_node(self, b_texture_node):
         self.b_textures[0] = b_texture_node
         b_texture_node.label = TEX_SLOTS.BASE
@@ -311,9 +334,8 @@ class NodeWrapper:
         links = self.b_shader_tree.links
         group_name = "InvertY"
 
-        if group_name in bpy.data.node_groups:
-            node_group = bpy.data.node_groups[group_name]
-        else:
+        node_group = bpy.data.node_groups.get(group_name)
+        if not node_group:
             # The InvertY node group does not yet exist, create it
             node_group = bpy.data.node_groups.new(group_name, "ShaderNodeTree")
             group_nodes = node_group.nodes
@@ -403,17 +425,13 @@ class NodeWrapper:
         # b_texture_node.use_map_specular = True
         # b_texture_node.use_map_color_spec = True
 
-    def link_decal_0_node(self, b_texture_node):
-        b_texture_node.label = TEX_SLOTS.DECAL_0
+    def link_decal_node(self, b_texture_node, label):
+        b_texture_node.label = label
         self.b_diffuse_pass = self.connect_to_pass(self.b_diffuse_pass, b_texture_node, texture_type="Decal")
 
-    def link_decal_1_node(self, b_texture_node):
-        b_texture_node.label = TEX_SLOTS.DECAL_1
-        self.b_diffuse_pass = self.connect_to_pass(self.b_diffuse_pass, b_texture_node, texture_type="Decal")
-
-    def link_decal_2_node(self, b_texture_node):
-        b_texture_node.label = TEX_SLOTS.DECAL_2
-        self.b_diffuse_pass = self.connect_to_pass(self.b_diffuse_pass, b_texture_node, texture_type="Decal")
+    link_decal_0_node = partialmethod(link_decal_node, label=TEX_SLOTS.DECAL_0)
+    link_decal_1_node = partialmethod(link_decal_node, label=TEX_SLOTS.DECAL_1)
+    link_decal_2_node = partialmethod(link_decal_node, label=TEX_SLOTS.DECAL_2)
 
     def link_detail_node(self, b_texture_node):
         b_texture_node.label = TEX_SLOTS.DETAIL
@@ -38,34 +38,55 @@
 # ***** END LICENSE BLOCK *****
 
 
-from functools import reduce
-
 import bpy
 from io_scene_niftools.utils.logging import NifLog
-from io_scene_niftools.utils.singleton import NifOp
+from io_scene_niftools.utils.singleton import NifOp, NifData
 from nifgen.formats.nif import classes as NifClasses
 
-import operator
 import os.path
 import traceback
 
+# alternate extensions tried when looking for a texture file
+TEXTURE_EXTENSIONS = ('.DDS', '.dds', '.PNG', '.png', '.TGA', '.tga', '.BMP', '.bmp', '.JPG', '.jpg')
+# maps both path separators found in nif files to the one of this platform
+SEPARATOR_TRANSLATION = str.maketrans('\\/', os.sep * 2)
+
 
 class TextureLoader:
     external_textures = set()
+    # texture search directories, by (import directory, texture directory preference, working directory)
+    search_paths = {}
+    # names of the images loaded for each absolute file path
+    # (only names are kept, blender invalidates image references on undo and when loading another file)
+    image_names = {}
+    # texture files found by import_external_source, by (file name, search directories), for the nif being imported
+    texture_paths = {}
+    texture_paths_data = None
 
     @staticmethod
-    def load_image(tex_path):
+    def get_abs_path(tex_path):
+        return os.path.normcase(os.path.normpath(bpy.path.abspath(tex_path)))
+
+    @classmethod
+    def load_image(cls, tex_path):
         """Returns an image or a generated image if none was found"""
-        name = os.path.basename(tex_path)
-        if name not in bpy.data.images:
-            try:
-                b_image = bpy.data.images.load(tex_path)
-            except:
-                NifLog.warn(f"Texture '{name}' not found or not supported and no alternate available")
-                b_image = bpy.data.images.new(name=name, width=1, height=1, alpha=True)
-                b_image.filepath = tex_path
-        else:
-            b_image = bpy.data.images[name]
+        abs_path = cls.get_abs_path(tex_path)
+        image_name = cls.image_names.get(abs_path)
+        if image_name is not None:
+            # the image may have been removed or renamed, or belong to a different file now
+            b_image = bpy.data.images.get(image_name)
+            if b_image and cls.get_abs_path(b_image.filepath) == abs_path:
+                return b_image
+
+        try:
+            # reuse an image that was loaded from the same file, but not one that merely shares its name
+            b_image = bpy.data.images.load(tex_path, check_existing=True)
+        except:
+            name = os.path.basename(tex_path)
+            NifLog.warn(f"Texture '{name}' not found or not supported and no alternate available")
+            b_image = bpy.data.images.new(name=name, width=1, height=1, alpha=True)
+            b_image.filepath = tex_path
+        cls.image_names[abs_path] = b_image.name
         return b_image
 
     def import_texture_source(self, source):
@@ -92,7 +113,9 @@ class TextureLoader:
             tex_path = self.generate_image_name()
 
         # only save them once per run, obviously only useful if file_name was set
-        if tex_path not in self.external_textures:
+        # (compare normalized paths, so spelling differences of the same file don't save it again)
+        tex_key = os.path.normcase(os.path.normpath(os.path.abspath(tex_path)))
+        if tex_key not in self.external_textures:
             # save embedded texture as dds file
             with open(tex_path, "wb") as stream:
                 try:
@@ -101,7 +124,7 @@ class TextureLoader:
                 except ValueError:
                     NifLog.warn(f"Pixel format not supported in embedded texture {tex_path}!")
                     traceback.print_exc()
-            self.external_textures.add(tex_path)
+            self.external_textures.add(tex_key)
 
         return self.load_image(tex_path)
 
@@ -117,37 +140,71 @@ class TextureLoader:
             n += 1
         return tex
 
-    def import_external_source(self, source):
-        # the texture uses an external image file
-        if isinstance(source, NifClasses.NiSourceTexture):
-            fn = source.file_name
-        elif isinstance(source, str):
-            fn = source
-        else:
-            raise TypeError("source must be NiSourceTexture or str")
+    @classmethod
+    def get_search_paths(cls, import_path):
+        """Return the directories to search for the textures of a nif in import_path."""
+        texture_directory = bpy.context.preferences.filepaths.texture_directory
+        cwd = os.getcwd()
+        key = (import_path, texture_directory, cwd)
+        if key in cls.search_paths:
+            return cls.search_paths[key]
 
-        fn = fn.replace('\\', os.sep)
-        fn = fn.replace('/', os.sep)
-        # go searching for it
-        import_path = os.path.dirname(NifOp.props.filepath)
         search_path_list = [import_path]
-        if bpy.context.preferences.filepaths.texture_directory:
-            search_path_list.append(bpy.context.preferences.filepaths.texture_directory)
+        if texture_directory:
+            search_path_list.append(texture_directory)
 
         # TODO [general][path] Implement full texture path finding.
-        nif_dir = os.path.join(os.getcwd(), 'nif')
+        nif_dir = os.path.join(cwd, 'nif')
         search_path_list.append(nif_dir)
 
+        import_path_lower = import_path.lower()
         # if it looks like a Morrowind style path, use common sense to guess texture path
-        meshes_index = import_path.lower().find("meshes")
+        meshes_index = import_path_lower.find("meshes")
         if meshes_index != -1:
             search_path_list.append(import_path[:meshes_index] + 'textures')
 
         # if it looks like a Civilization IV style path, use common sense to guess texture path
-        art_index = import_path.lower().find("art")
+        art_index = import_path_lower.find("art")
         if art_index != -1:
             search_path_list.append(import_path[:art_index] + 'shared')
 
+        search_path_list = tuple(search_path_list)
+        cls.search_paths[key] = search_path_list
+        return search_path_list
+
+    def import_external_source(self, source):
+        # the texture uses an external image file
+        if isinstance(source, NifClasses.NiSourceTexture):
+            fn = source.file_name
+        elif isinstance(source, str):
+            fn = source
+        else:
+            raise TypeError("source must be NiSourceTexture or str")
+
+        fn = fn.translate(SEPARATOR_TRANSLATION)
+        # go searching for it
+        search_path_list = self.get_search_paths(os.path.dirname(NifOp.props.filepath))
+        # reuse the file found for an earlier reference to this texture in the same import,
+        # textures may be moved or added between imports
+        if TextureLoader.texture_paths_data is not NifData.data:
+            TextureLoader.texture_paths = {}
+            TextureLoader.texture_paths_data = NifData.data
+        key = (fn, search_path_list)
+        tex_path = self.texture_paths.get(key)
+        if tex_path and os.path.exists(bpy.path.abspath(tex_path)):
+            return self.load_image(tex_path)
+
+        # go through all possible file names, try alternate extensions too; for linux, also try lower case versions of filenames
+        stem = fn[:-4]
+        stem_lower = stem.lower()
+        texfns = [fn, fn.lower()]
+        for ext in TEXTURE_EXTENSIONS:
+            texfns.append(stem + ext)
+            texfns.append(stem_lower + ext)
+        texfns = list(dict.fromkeys(texfns))
+
+        textures_prefix = 'textures' + os.sep
+        textures_suffix = os.sep + 'textures'
         # go through all texture search paths
         for texdir in search_path_list:
             if texdir[0:2] == "//":
@@ -156,19 +213,10 @@ class TextureLoader:
                 texdir = texdir[2:]
             else:
                 relative = False
-            texdir = texdir.replace('\\', os.sep)
-            texdir = texdir.replace('/', os.sep)
-            # go through all possible file names, try alternate extensions too; for linux, also try lower case versions of filenames
-            texfns = reduce(operator.add,
-                            [[fn[:-4] + ext, fn[:-4].lower() + ext]
-                             for ext in ('.DDS', '.dds', '.PNG', '.png',
-                                         '.TGA', '.tga', '.BMP', '.bmp',
-                                         '.JPG', '.jpg')])
-
-            texfns = [fn, fn.lower()] + list(set(texfns))
+            texdir = texdir.translate(SEPARATOR_TRANSLATION)
             for texfn in texfns:
                 # now a little trick, to satisfy many Morrowind mods
-                if texfn[:9].lower() == 'textures' + os.sep and texdir[-9:].lower() == os.sep + 'textures':
+                if texfn[:9].lower() == textures_prefix and texdir[-9:].lower() == textures_suffix:
                     # strip one of the two 'textures' from the path
                     tex = os.path.join(texdir[:-9], texfn)
                 else:
@@ -181,9 +229,9 @@ class TextureLoader:
                 NifLog.debug(f"Searching {tex}")
                 if os.path.exists(tex):
                     if relative:
-                        return self.load_image(bpy.path.relpath(tex))
-                    else:
-                        return self.load_image(tex)
+                        tex = bpy.path.relpath(tex)
+                    self.texture_paths[key] = tex
+                    return self.load_image(tex)
 
         else:
             tex = fn
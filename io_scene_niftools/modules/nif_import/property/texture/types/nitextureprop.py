@@ -37,7 +37,7 @@
 #
 # ***** END LICENSE BLOCK *****
 
-from io_scene_niftools.utils.consts import TEX_SLOTS
+from io_scene_niftools.utils.consts import TEX_SLOTS, TEX_SLOT_FIELD_TRANSLATION
 from io_scene_niftools.utils.logging import NifLog
 
 
@@ -54,7 +54,7 @@ class NiTextureProp:
         # go over all valid texture slots
         for slot_name, _ in self.slots.items():
             # get the field name used by nif xml for this texture
-            slot_lower = slot_name.lower().replace(' ', '_')
+            slot_lower = slot_name.translate(TEX_SLOT_FIELD_TRANSLATION)
             field_name = f"{slot_lower}_texture"
             # get the tex desc link
             has_tex = getattr(n_texture_desc, "has_" + field_name, None)
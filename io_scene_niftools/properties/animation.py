@@ -70,9 +70,9 @@ class AnimationProperty(PropertyGroup):
     )
 
 
-CLASSES = [
-    AnimationProperty
-]
+CLASSES = (
+    AnimationProperty,
+)
 
 
 def register():
@@ -88,10 +88,10 @@ class ArmatureProperties(PropertyGroup):
     )
 
 
-CLASSES = [
+CLASSES = (
     BoneProperties,
-    ArmatureProperties
-]
+    ArmatureProperties,
+)
 
 
 def register():
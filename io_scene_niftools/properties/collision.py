@@ -172,9 +172,9 @@ class CollisionProperties(PropertyGroup):
         min=0
     )
 
-CLASSES = [
-    CollisionProperties
-]
+CLASSES = (
+    CollisionProperties,
+)
 
 def register():
     register_classes(CLASSES, __name__)
@@ -63,9 +63,9 @@ class ConstraintProperty(PropertyGroup):
     )
 
 
-CLASSES = [
-    ConstraintProperty
-]
+CLASSES = (
+    ConstraintProperty,
+)
 
 
 def register():
@@ -118,10 +118,10 @@ class AlphaProperties(PropertyGroup):
         default=0
     )
 
-CLASSES = [
+CLASSES = (
     MaterialProperties,
-    AlphaProperties
-]
+    AlphaProperties,
+)
 
 def register():
     register_classes(CLASSES, __name__)
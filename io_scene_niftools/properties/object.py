@@ -48,6 +48,21 @@ from bpy.types import PropertyGroup
 from io_scene_niftools.utils.decorators import register_classes, unregister_classes
 from nifgen.formats.nif import classes as NifClasses
 
+# built once, and kept referenced at module level for as long as blender uses them
+CONSISTENCY_TYPE_ITEMS = tuple((member.name, member.name, "", i) for i, member in enumerate(NifClasses.ConsistencyType))
+NODE_TYPE_ITEMS = (
+    ('NiNode', 'NiNode', "", 0),
+    ('BSFadeNode', 'BSFadeNode', "", 1),
+    ('NiLODNode', 'NiLODNode', "", 2),
+    ('NiBillboardNode', 'NiBillboardNode', "", 3),
+    ('BSBlastNode', 'BSBlastNode', "", 4),
+    ('BSDamageStage', 'BSDamageStage', "", 5),
+    ('BSDebrisNode', 'BSDebrisNode', "", 6),
+    ('BSMultiBoundNode', 'BSMultiBoundNode', "", 7),
+    ('BSOrderedNode', 'BSOrderedNode', "", 8),
+    ('BSValueNode', 'BSValueNode', "", 9),
+    ('BSMasterParticleSystem', 'BSMasterParticleSystem', "", 10))
+
 
 class BsInventoryMarker(PropertyGroup):
     name: StringProperty(
@@ -82,26 +97,12 @@ class BsInventoryMarker(PropertyGroup):
         default=1
     )
 
-prn_versioned_arguments = {}
-if bpy.app.version >= (3, 3, 0):
-    prn_versioned_arguments['search'] = lambda self, context, edit_text: prn_map.get(context.scene.niftools_scene.game,
-                                                                                     [])
+
 class ObjectProperty(PropertyGroup):
     nodetype: EnumProperty(
         name='Node Type',
         description='Type of node this empty represents',
-        items=(
-            ('NiNode', 'NiNode', "", 0),
-            ('BSFadeNode', 'BSFadeNode', "", 1),
-            ('NiLODNode', 'NiLODNode', "", 2),
-            ('NiBillboardNode', 'NiBillboardNode', "", 3),
-            ('BSBlastNode', 'BSBlastNode', "", 4),
-            ('BSDamageStage', 'BSDamageStage', "", 5),
-            ('BSDebrisNode', 'BSDebrisNode', "", 6),
-            ('BSMultiBoundNode', 'BSMultiBoundNode', "", 7),
-            ('BSOrderedNode', 'BSOrderedNode', "", 8),
-            ('BSValueNode', 'BSValueNode', "", 9),
-            ('BSMasterParticleSystem', 'BSMasterParticleSystem', "", 10)),
+        items=NODE_TYPE_ITEMS,
         default='NiNode',
     )
 
@@ -113,7 +114,7 @@ class ObjectProperty(PropertyGroup):
     consistency_flags: EnumProperty(
         name='Consistency Flag',
         description='Controls animation type',
-        items=[(member.name, member.name, "", i) for i, member in enumerate(NifClasses.ConsistencyType)],
+        items=CONSISTENCY_TYPE_ITEMS,
         # default = 'SHADER_DEFAULT'
     )
 
@@ -145,10 +146,10 @@ class ObjectProperty(PropertyGroup):
     bs_inv: bpy.props.CollectionProperty(type=BsInventoryMarker)
 
 
-CLASSES = [
+CLASSES = (
     BsInventoryMarker,
     ObjectProperty,
-]
+)
 
 
 def register():
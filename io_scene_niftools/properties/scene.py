@@ -131,9 +131,9 @@ class SceneProperty(PropertyGroup):
         min=0.001, max=100.0, precision=2)
 
 
-CLASSES = [
-    SceneProperty
-]
+CLASSES = (
+    SceneProperty,
+)
 
 
 def register():
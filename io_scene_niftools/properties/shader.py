@@ -109,9 +109,9 @@ if annotations_dict:
             if property_name not in annotations_dict:
                 annotations_dict[property_name] = BoolProperty(name=prettify_prop_name(property_name))
 
-CLASSES = [
-    ShaderProperty
-]
+CLASSES = (
+    ShaderProperty,
+)
 
 
 def register():
@@ -37,6 +37,8 @@
 # ***** END LICENSE BLOCK *****
 
 
+import string
+
 B_R_POSTFIX = "].R"
 B_L_POSTFIX = "].L"
 
@@ -87,6 +89,9 @@ TEX_SLOTS.NORMAL = "normal"
 TEX_SLOTS.ENV_MAP = "environment map"
 TEX_SLOTS.ENV_MASK = "environment mask"
 
+# Turns a texture slot name into the stem of its nif xml field name, e.g. "bump map" -> "bump_map"
+TEX_SLOT_FIELD_TRANSLATION = str.maketrans(string.ascii_uppercase + " ", string.ascii_lowercase + "_")
+
 BS_TEX_SLOTS = EmptyObject()
 BS_TEX_SLOTS.DIFFUSE_MAP = "Diffuse Map"
 BS_TEX_SLOTS.NORMAL_MAP = "Normal Map"
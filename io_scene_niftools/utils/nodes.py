@@ -17,6 +17,9 @@ def nodes_iterate(ntree, nodeoutput):
     level = 0
 
     while a[level]:
+        # remove duplicate nodes at the same level, first wins
+        # (doing this before expanding the level keeps shared subgraphs from being walked once per path)
+        a[level] = list(OrderedDict(zip(a[level], repeat(None))))
         a.append([])
         # print (f"level: {level}")
 
@@ -44,11 +47,6 @@ def nodes_iterate(ntree, nodeoutput):
     del a[level]
     level -= 1
 
-    # remove duplicate nodes at the same level, first wins
-    for x, nodes in enumerate(a):
-        a[x] = list(OrderedDict(zip(a[x], repeat(None))))
-    # print ("Duplicate nodes removed")
-
     # remove duplicate nodes in all levels, last wins
     top = level
     for row1 in range(top, 1, -1):
@@ -83,7 +81,8 @@ def nodes_arrange(ntree, nodelist, level):
     for node in nodelist:
         parents.append(node.parent)
         node.parent = None
-        ntree.nodes.update()
+    # update once for the whole level rather than after every unparented node
+    ntree.nodes.update()
 
     # print ("nodes arrange def")
     # node x positions
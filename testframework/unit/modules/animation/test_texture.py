@@ -0,0 +1,66 @@
+"""Unit testing the texture animation export helpers"""
+
+# ***** BEGIN LICENSE BLOCK *****
+#
+# Copyright © 2025 NIF File Format Library and Tools contributors.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above
+#      copyright notice, this list of conditions and the following
+#      disclaimer in the documentation and/or other materials provided
+#      with the distribution.
+#
+#    * Neither the name of the NIF File Format Library and Tools
+#      project nor the names of its contributors may be used to endorse
+#      or promote products derived from this software without specific
+#      prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+# ***** END LICENSE BLOCK *****
+
+import nose
+
+from io_scene_niftools.modules.nif_export.animation.texture import TextureAnimation
+from nifgen.formats.nif import classes as NifClasses
+
+
+class TestTextureAnimation:
+
+    def test_operation_from_uv_warp_rotation(self):
+        operation = TextureAnimation.get_operation_from_data_path('modifiers["UVWarp"].rotation')
+        nose.tools.assert_equals(operation, "TT_ROTATE")
+
+    def test_operation_from_uv_warp_offset(self):
+        operation = TextureAnimation.get_operation_from_data_path('modifiers["UVWarp"].offset', 1)
+        nose.tools.assert_is_none(operation)
+
+    def test_operation_from_unknown_data_path(self):
+        operation = TextureAnimation.get_operation_from_data_path('modifiers["UVWarp"].scale')
+        nose.tools.assert_is_none(operation)
+
+    def test_constant_interpolation(self):
+        n_interpolation = TextureAnimation.get_nif_interpolation('CONSTANT')
+        nose.tools.assert_equals(n_interpolation, NifClasses.KeyType.CONST_KEY)
+
+    def test_unknown_interpolation_falls_back_to_linear(self):
+        n_interpolation = TextureAnimation.get_nif_interpolation('ELASTIC')
+        nose.tools.assert_equals(n_interpolation, NifClasses.KeyType.LINEAR_KEY)
@@ -0,0 +1,89 @@
+"""Unit testing the block indices of the export block registry"""
+
+# ***** BEGIN LICENSE BLOCK *****
+#
+# Copyright © 2025 NIF File Format Library and Tools contributors.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above
+#      copyright notice, this list of conditions and the following
+#      disclaimer in the documentation and/or other materials provided
+#      with the distribution.
+#
+#    * Neither the name of the NIF File Format Library and Tools
+#      project nor the names of its contributors may be used to endorse
+#      or promote products derived from this software without specific
+#      prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+# ***** END LICENSE BLOCK *****
+
+import nose
+
+from io_scene_niftools.modules.nif_export.block_registry import ExportBlockRegistry
+
+
+class DummyBlock:
+
+    def __init__(self, block_hash):
+        self.block_hash = block_hash
+
+    def get_hash(self):
+        return self.block_hash
+
+
+class OtherDummyBlock(DummyBlock):
+    pass
+
+
+class TestExportBlockRegistry:
+
+    def setup(self):
+        self.registry = ExportBlockRegistry()
+
+    def test_register_unique_block_returns_identical_block(self):
+        n_block = self.registry.register_unique_block(DummyBlock((1, 2)))
+        n_duplicate = self.registry.register_unique_block(DummyBlock((1, 2)))
+        nose.tools.assert_is(n_duplicate, n_block)
+        nose.tools.assert_equals(list(self.registry.block_to_obj), [n_block])
+
+    def test_register_unique_block_different_hash(self):
+        n_block = self.registry.register_unique_block(DummyBlock((1, 2)))
+        n_other = self.registry.register_unique_block(DummyBlock((1, 3)))
+        nose.tools.assert_is_not(n_other, n_block)
+        nose.tools.assert_equals(len(self.registry.block_to_obj), 2)
+
+    def test_register_unique_block_different_type(self):
+        n_block = self.registry.register_unique_block(DummyBlock((1, 2)))
+        n_other = self.registry.register_unique_block(OtherDummyBlock((1, 2)))
+        nose.tools.assert_is_not(n_other, n_block)
+
+    def test_block_to_obj_reset_clears_indices(self):
+        n_block = self.registry.register_unique_block(DummyBlock((1, 2)))
+        self.registry.matching_blocks[(DummyBlock, (1, 2))] = n_block
+
+        self.registry.block_to_obj = {}
+        nose.tools.assert_equals(self.registry.matching_blocks, {})
+
+        n_new_block = self.registry.register_unique_block(DummyBlock((1, 2)))
+        nose.tools.assert_is_not(n_new_block, n_block)
+        nose.tools.assert_equals(list(self.registry.block_to_obj), [n_new_block])